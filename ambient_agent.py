@@ -1,19 +1,35 @@
 # MINIMAL IMPORTS AT MODULE LEVEL - Keep under 5 seconds for AgentCore init
+import os
 import json
+import asyncio
 import logging
+import threading
 from typing import Dict, Any
 
 # Initialize BedrockAgentCoreApp early - this is required at module level
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 app = BedrockAgentCoreApp()
 
-# Conditionally import langsmith traceable decorator (optional observability)
-try:
-    from langsmith import traceable
-except ImportError:
-    # If langsmith not available, create a no-op decorator
-    def traceable(func):
-        return func
+# Conditionally import langsmith traceable decorator (optional observability).
+# langsmith is only imported when tracing is switched on - otherwise the
+# decorator has nothing to record and the import would only add to init time
+def traceable(func):
+    # No-op decorator used when tracing is disabled or langsmith not available
+    return func
+
+# langsmith turns tracing on from any of these variables
+_TRACING_ENV_VARS = (
+    "LANGSMITH_TRACING",
+    "LANGSMITH_TRACING_V2",
+    "LANGCHAIN_TRACING",
+    "LANGCHAIN_TRACING_V2",
+)
+
+if any((os.environ.get(name) or "").lower() == "true" for name in _TRACING_ENV_VARS):
+    try:
+        from langsmith import traceable
+    except ImportError:
+        pass
 
 # Set up logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -24,29 +40,70 @@ monitoring_agent = None
 _initialized = False
 _config_data = None
 _agent_system_prompt = None
+_executor = None
+_boto_session = None
+_init_lock = threading.Lock()
+
+def _get_session():
+    """
+    Return the boto3 session used to build the agent's AWS clients,
+    creating it on first use so credentials and region are resolved only once.
+    """
+    global _boto_session
+
+    if _boto_session is None:
+        import boto3
+        _boto_session = boto3.session.Session()
+    return _boto_session
+
+def _ensure_default_executor():
+    """
+    Install a single shared thread pool as the default executor of the running
+    event loop so that concurrent requests do not queue behind each other on
+    the much smaller asyncio default pool.
+    """
+    global _executor
+
+    from concurrent.futures import ThreadPoolExecutor
+    from constants import AGENT_EXECUTOR_MAX_WORKERS
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=AGENT_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="agent-worker"
+        )
+    asyncio.get_running_loop().set_default_executor(_executor)
 
 def initialize_agent():
     """
     Initialize heavy components only when needed to prevent AgentCore timeout.
-    This function is called on first request instead of at module load time.
+    This function is started in a background thread once the module has loaded
+    and is also called on first request, which waits for the warm-up to finish.
 
     All heavy imports (boto3, langchain, langgraph, etc.) are deferred here.
     """
-    global monitoring_agent, _initialized, _config_data, _agent_system_prompt
-
     if _initialized:
         return
 
-    logger.info("Initializing agent components on first request...")
+    with _init_lock:
+        if _initialized:
+            return
+        _initialize_agent_components()
+
+def _initialize_agent_components():
+    """
+    Build the monitoring agent. Must be called with _init_lock held.
+    """
+    global monitoring_agent, _initialized, _config_data, _agent_system_prompt
+
+    logger.info("Initializing agent components...")
 
     # DEFERRED IMPORTS - These happen AFTER AgentCore runtime init completes
     import json
-    import boto3
     from typing import List
     from botocore.config import Config
     from langchain_aws import ChatBedrock
     from langchain.agents import create_agent
-    from langgraph.checkpoint.memory import MemorySaver
 
     # Import tools only when needed
     from tools import (
@@ -59,12 +116,14 @@ def initialize_agent():
         setup_cross_account_access,
     )
     from utils import load_config, load_system_prompt
-    from constants import CONFIG_FILE_FNAME
+    from checkpointer import BoundedMemorySaver
+    from constants import CONFIG_FILE_FNAME, CHECKPOINT_MAX_THREADS
 
     # Load configuration
     logger.info("Loading configuration file...")
     _config_data = load_config(CONFIG_FILE_FNAME)
-    logger.info(f"Loaded configuration: {json.dumps(_config_data, indent=4)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Loaded configuration: %s", json.dumps(_config_data, indent=4))
 
     agent_model_configuration = _config_data['model_information']
     agent_system_prompt_fpath = agent_model_configuration['system_prompt_fpath']
@@ -82,9 +141,10 @@ def initialize_agent():
     )
 
     # Create a boto3 client with custom timeout configuration
-    bedrock_runtime_client = boto3.client(
+    boto_session = _get_session()
+    bedrock_runtime_client = boto_session.client(
         service_name='bedrock-runtime',
-        region_name=boto3.session.Session().region_name or 'us-east-1',
+        region_name=boto_session.region_name or 'us-east-1',
         config=bedrock_config
     )
 
@@ -98,7 +158,7 @@ def initialize_agent():
             "top_p": agent_model_configuration["inference_parameters"]["top_p"],
         }
     )
-    logger.info(f"Initialized Amazon Bedrock model: {agent_model_configuration['model_id']}")
+    logger.info("Initialized Amazon Bedrock model: %s", agent_model_configuration['model_id'])
 
     monitoring_tools: List = [
         list_cloudwatch_dashboards,
@@ -110,8 +170,9 @@ def initialize_agent():
         setup_cross_account_access,
     ]
 
-    # Create checkpointer for conversation memory
-    checkpointer = MemorySaver()
+    # Create checkpointer for conversation memory, bounded so that
+    # unique session IDs cannot grow the process memory without limit
+    checkpointer = BoundedMemorySaver(max_threads=CHECKPOINT_MAX_THREADS)
 
     # Create the agent with checkpointer
     monitoring_agent = create_agent(
@@ -124,9 +185,24 @@ def initialize_agent():
     _initialized = True
     logger.info("Ambient monitoring agent created successfully with checkpointing enabled")
 
+def _warm_up_agent():
+    """
+    Run initialize_agent in the background so the first request does not pay
+    for it. Failures are logged and retried on the first request.
+    """
+    try:
+        initialize_agent()
+    except Exception:
+        logger.error("Background agent initialization failed", exc_info=True)
+
+# Start warming up the agent once the module has loaded - the AgentCore
+# runtime only needs `app` to be defined, so this overlaps with its bootstrap
+_warm_thread = threading.Thread(target=_warm_up_agent, name="agent-warmup", daemon=True)
+_warm_thread.start()
+
 @traceable
 @app.entrypoint
-def agent_handler(payload: Dict[str, Any]) -> str:
+async def agent_handler(payload: Dict[str, Any]) -> str:
     """
     Handle incoming payload and return agent response.
 
@@ -145,18 +221,23 @@ def agent_handler(payload: Dict[str, Any]) -> str:
             logger.error(error_msg)
             return json.dumps({"error": error_msg})
 
-        logger.info(f"Received prompt: {user_prompt}")
+        logger.info("Received prompt: %s", user_prompt)
 
-        # Initialize agent components lazily on first request
-        initialize_agent()
+        # Use the shared thread pool for blocking work on this event loop
+        if _executor is None:
+            _ensure_default_executor()
+
+        # Wait for the background warm-up (or initialize here if it failed)
+        if not _initialized:
+            await asyncio.to_thread(initialize_agent)
 
         # Thread configuration for maintaining conversation state
         # You can make this dynamic based on session_id in payload if needed
         thread_id = payload.get("session_id", "default-session")
         thread_config = {"configurable": {"thread_id": thread_id}}
 
-        # Invoke agent with the prompt
-        result = monitoring_agent.invoke(
+        # Invoke agent with the prompt without blocking the event loop
+        result = await monitoring_agent.ainvoke(
             {"messages": [{"role": "user", "content": user_prompt}]},
             thread_config
         )
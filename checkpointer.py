@@ -0,0 +1,58 @@
+"""
+Conversation checkpointing for the ambient monitoring agent.
+"""
+import threading
+from collections import OrderedDict
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import Checkpoint, CheckpointMetadata, ChannelVersions
+from langgraph.checkpoint.memory import MemorySaver
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    In-memory checkpointer that keeps at most `max_threads` conversation threads.
+
+    MemorySaver never forgets a thread, so every new session ID grows the
+    process memory for as long as the runtime is alive. This variant tracks
+    threads in least-recently-updated order and deletes the oldest thread's
+    checkpoints, writes and blobs once the limit is exceeded.
+    """
+
+    def __init__(self, max_threads: int = 1000, **kwargs):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self._thread_order: OrderedDict = OrderedDict()
+        self._thread_order_lock = threading.Lock()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Save a checkpoint and evict the least recently updated threads if needed.
+        """
+        result = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = config["configurable"]["thread_id"]
+        with self._thread_order_lock:
+            self._thread_order[thread_id] = None
+            self._thread_order.move_to_end(thread_id)
+            evicted = []
+            while len(self._thread_order) > self.max_threads:
+                evicted.append(self._thread_order.popitem(last=False)[0])
+
+        for evicted_thread_id in evicted:
+            super().delete_thread(evicted_thread_id)
+        return result
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete all checkpoints and writes associated with a thread ID.
+        """
+        with self._thread_order_lock:
+            self._thread_order.pop(thread_id, None)
+        super().delete_thread(thread_id)
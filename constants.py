@@ -1,3 +1,11 @@
 # This file contains the constants that are used across the agent implementation
 
-CONFIG_FILE_FNAME: str = 'config.yaml'
\ No newline at end of file
+CONFIG_FILE_FNAME: str = 'config.yaml'
+
+# Size of the shared thread pool used by the agent's event loop for blocking
+# work such as the boto3 calls made by the model and the monitoring tools
+AGENT_EXECUTOR_MAX_WORKERS: int = 32
+
+# Maximum number of conversation threads kept in the in-memory checkpointer
+# before the least recently updated thread is evicted
+CHECKPOINT_MAX_THREADS: int = 1000
@@ -186,8 +186,28 @@ echo ""
 echo "📦 Step 3: Packaging Lambda function..."
 
 cd "$PARENT_DIR/lambda"
-# package the lambda function
-zip -r /tmp/scheduled_monitor.zip scheduled_monitor.py
+# package the lambda function together with its dependencies, built for the
+# Lambda runtime (python3.11 on x86_64)
+LAMBDA_BUILD_DIR=$(mktemp -d)
+cp scheduled_monitor.py "$LAMBDA_BUILD_DIR/"
+pip install \
+    --requirement requirements.txt \
+    --target "$LAMBDA_BUILD_DIR" \
+    --platform manylinux2014_x86_64 \
+    --python-version 3.11 \
+    --only-binary=:all: \
+    --quiet || echo "⚠️  Could not install Lambda dependencies, falling back to the standard library"
+# Pre-compile bytecode so cold starts do not compile the sources (the Lambda
+# file system is read-only, so it could never be cached there). This needs the
+# same interpreter version as the runtime; otherwise the sources are shipped as-is
+if command -v python3.11 >/dev/null 2>&1; then
+    python3.11 -m compileall -q --invalidation-mode unchecked-hash "$LAMBDA_BUILD_DIR"
+else
+    echo "⚠️  python3.11 not found, skipping bytecode pre-compilation"
+fi
+rm -f /tmp/scheduled_monitor.zip
+(cd "$LAMBDA_BUILD_DIR" && zip -r /tmp/scheduled_monitor.zip .)
+rm -rf "$LAMBDA_BUILD_DIR"
 
 echo "✅ Lambda function packaged"
 echo ""
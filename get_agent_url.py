@@ -2,12 +2,19 @@
 # convert it into an http url that can then be used in 
 # invoking the agent with the required set of credentials
 #!/usr/bin/env python3
+import functools
 import urllib.parse
+from typing import Optional
 from boto3.session import Session
 
-def build_agent_url(agent_arn: str) -> str:
-    session = Session()
-    region = session.region_name or "us-west-2"
+@functools.lru_cache(maxsize=None)
+def _default_region() -> str:
+    # resolving the session region parses the aws config files, so do it once
+    return Session().region_name or "us-west-2"
+
+@functools.lru_cache(maxsize=None)
+def build_agent_url(agent_arn: str, region: Optional[str] = None) -> str:
+    region = region or _default_region()
     endpoint = f"https://bedrock-agentcore.{region}.amazonaws.com"
     escaped = urllib.parse.quote(agent_arn, safe="")
     return f"{endpoint}/runtimes/{escaped}/invocations?qualifier=DEFAULT"
@@ -9,13 +9,119 @@ Invokes AgentCore runtime via HTTP and posts results to Slack.
 import os
 import hmac
 import json
-import hashlib
+import time
+import codecs
 import urllib3
+import logging
 from datetime import datetime
-from urllib.parse import parse_qs
+from urllib.parse import parse_qs, urlencode
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+# orjson is bundled into the deployment package by deployment/deploy.sh and
+# encodes straight to bytes; fall back to the standard library if it is missing
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+
+# The Lambda runtime attaches its own handler to the root logger, so only the
+# level needs to be set. Messages are formatted lazily by the logging module
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+# Shared connection pools, reused by warm invocations. Keep a few keep-alive
+# connections per host (AgentCore, Slack, Cognito) and retry only connection
+# failures with a short backoff - every request here is a POST, which must
+# not be re-sent once it may have reached the server
+http = urllib3.PoolManager(
+    maxsize=4,
+    retries=urllib3.Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=0,
+        backoff_factor=0.1
+    )
+)
+
+# Background workers for Slack posts that can overlap with other work
+_executor = ThreadPoolExecutor(max_workers=2)
+
+# Longest the handler waits for an error notification to reach Slack
+ERROR_NOTIFICATION_TIMEOUT_SECONDS = 2.0
+
+# Timeout for each attempt to post the Slack acknowledgment, and the longest
+# the handler waits for it before moving on
+ACKNOWLEDGMENT_TIMEOUT_SECONDS = 3.0
+
+# Bearer tokens cached across warm invocations of the same Lambda container,
+# keyed by (domain_url, client_id, resource_server_id)
+_TOKEN_CACHE = {}
+
+# Refresh cached tokens this many seconds before they actually expire
+TOKEN_EXPIRY_MARGIN_SECONDS = 30
+
+# Static request headers and Slack blocks, built once per container and
+# shared by every invocation (they are only ever read, never mutated)
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+_FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+_DIVIDER_BLOCK = {"type": "divider"}
+
+# Maximum characters of agent response shown in a Slack section block
+# (Slack allows 3000 characters per block)
+SLACK_RESPONSE_MAX_CHARS = 2900
 
+# Only this many bytes of the agent response are decoded - enough for
+# SLACK_RESPONSE_MAX_CHARS even if every character is a 4-byte codepoint
+AGENT_RESPONSE_PREVIEW_BYTES = 4 * SLACK_RESPONSE_MAX_CHARS
 
-http = urllib3.PoolManager()
+_REPORT_HEADER_BLOCK = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "📊 AWS Monitoring Report",
+        "emoji": True
+    }
+}
+
+_NEXT_CHECK_CONTEXT_BLOCK = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": "_Next check in 15 minutes_"
+        }
+    ]
+}
+
+_ERROR_HEADER_BLOCK = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "🚨 Monitoring Agent Error"
+    }
+}
+
+_ANSWER_HEADER_BLOCK = {
+    "type": "header",
+    "text": {
+        "type": "plain_text",
+        "text": "💬 Question Answer",
+        "emoji": True
+    }
+}
 
 
 def verify_slack_request(
@@ -49,11 +155,11 @@ def verify_slack_request(
 
     # Compute signature
     sig_basestring = f"v0:{timestamp}:{event['body']}"
-    computed_signature = 'v0=' + hmac.new(
+    computed_signature = 'v0=' + hmac.digest(
         signing_secret.encode('utf-8'),
         sig_basestring.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
+        'sha256'
+    ).hex()
 
     # Compare signatures
     if not hmac.compare_digest(computed_signature, signature):
@@ -68,8 +174,9 @@ def lambda_handler(event, context):
     1. EventBridge (scheduled): Uses default monitoring prompt
     2. Slack slash command: Accepts user questions via API Gateway
     """
-    print(f"Monitoring check started at {datetime.now()}")
-    print(f"Event received: {json.dumps(event)}")
+    logger.info("Monitoring check started at %s", datetime.now())
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Event received: %s", json.dumps(event))
 
     # Get configuration from environment variables
     agentcore_url: str = os.environ.get('AGENTCORE_RUNTIME_URL')
@@ -83,21 +190,21 @@ def lambda_handler(event, context):
     resource_server_id = os.environ.get('RESOURCE_SERVER_ID')
 
     if not agentcore_url:
-        print("ERROR: AGENTCORE_RUNTIME_URL not set")
+        logger.error("AGENTCORE_RUNTIME_URL not set")
         return {'statusCode': 500, 'body': 'Missing AgentCore URL'}
 
     # Determine trigger source and extract parameters
     is_slack_request = 'body' in event and 'headers' in event
 
     if is_slack_request:
-        print("Processing Slack slash command request")
+        logger.info("Processing Slack slash command request")
 
         # Verify Slack request signature for security
         if slack_signing_secret:
             try:
                 verify_slack_request(event, slack_signing_secret)
             except Exception as e:
-                print(f"Slack verification failed: {str(e)}")
+                logger.warning("Slack verification failed: %s", e)
                 return {
                     'statusCode': 401,
                     'body': json.dumps({'error': 'Unauthorized'})
@@ -118,12 +225,14 @@ def lambda_handler(event, context):
                     'text': 'Please provide a question. Usage: `/ask <your question>`'
                 })
             }
-        print(f"User '{user_name}' from #{channel_name} asked: {user_question}")
-        # Immediately acknowledge Slack (must respond within 3 seconds)
+        logger.info("User '%s' from #%s asked: %s", user_name, channel_name, user_question)
+        # Immediately acknowledge Slack (must respond within 3 seconds). The
+        # acknowledgment is ephemeral like the answer, so the question is only
+        # shown to the user who asked it
         initial_response = {
             'statusCode': 200,
             'body': json.dumps({
-                'response_type': 'in_channel',
+                'response_type': 'ephemeral',
                 'text': f'🤔 Processing your question: "{user_question}"...'
             })
         }
@@ -134,9 +243,9 @@ def lambda_handler(event, context):
         is_scheduled = False
 
     else:
-        print("Processing scheduled EventBridge monitoring check")
+        logger.info("Processing scheduled EventBridge monitoring check")
         if not slack_webhook_url:
-            print("ERROR: SLACK_WEBHOOK_URL not set")
+            logger.error("SLACK_WEBHOOK_URL not set")
             return {'statusCode': 500, 'body': 'Missing Slack webhook URL'}
 
         # Set parameters for scheduled monitoring
@@ -146,19 +255,26 @@ def lambda_handler(event, context):
         is_scheduled = True
         initial_response = None
 
+    ack_future = None
     try:
-        # For Slack requests, return immediate acknowledgment
-        if is_slack_request and initial_response:
-            # Process the request asynchronously after acknowledging
-            # Note: Lambda will continue processing after return
-            pass
+        # For Slack requests, post the acknowledgment to response_url in the
+        # background so it overlaps with the token fetch and AgentCore call
+        if is_slack_request and initial_response and response_url:
+            ack_future = _executor.submit(
+                http.request,
+                'POST',
+                response_url,
+                body=initial_response['body'].encode('utf-8'),
+                headers=_JSON_HEADERS,
+                timeout=ACKNOWLEDGMENT_TIMEOUT_SECONDS
+            )
 
         # Step 1: Get Cognito token
-        print("Retrieving Cognito token...")
+        logger.info("Retrieving Cognito token...")
 
         # Try client credentials first (preferred M2M method)
         if m2m_client_id and m2m_client_secret and cognito_domain_url:
-            print("Using client credentials authentication (M2M)")
+            logger.debug("Using client credentials authentication (M2M)")
             bearer_token = get_token_using_client_credentials(
                 domain_url=cognito_domain_url,
                 client_id=m2m_client_id,
@@ -169,7 +285,7 @@ def lambda_handler(event, context):
             raise Exception("No valid authentication credentials provided. Need either M2M credentials or username/password")
 
         # Step 2: Invoke AgentCore runtime via HTTP
-        print(f"Invoking AgentCore runtime with prompt: {prompt[:100]}...")
+        logger.info("Invoking AgentCore runtime with prompt: %.100s...", prompt)
 
         agent_payload = {
             "prompt": prompt,
@@ -179,9 +295,9 @@ def lambda_handler(event, context):
         response = http.request(
             'POST',
             agentcore_url,
-            body=json.dumps(agent_payload).encode('utf-8'),
+            body=_json_dumps(agent_payload),
             headers={
-                'Content-Type': 'application/json',
+                **_JSON_HEADERS,
                 'Authorization': f'Bearer {bearer_token}'
             }
         )
@@ -189,30 +305,48 @@ def lambda_handler(event, context):
         if response.status != 200:
             raise Exception(f"AgentCore request failed: {response.status} - {response.data.decode('utf-8')}")
 
-        agent_response = response.data.decode('utf-8')
-        print(f"Agent response received: {len(agent_response)} characters")
+        # Only decode the part of the response that can be shown in Slack. A
+        # cut prefix may end inside a multi-byte character, which the
+        # incremental decoder holds back instead of failing on; invalid bytes
+        # anywhere else still raise
+        agent_response_bytes = len(response.data)
+        is_truncated = agent_response_bytes > AGENT_RESPONSE_PREVIEW_BYTES
+        if is_truncated:
+            agent_response = codecs.getincrementaldecoder('utf-8')().decode(
+                response.data[:AGENT_RESPONSE_PREVIEW_BYTES],
+                final=False
+            )
+        else:
+            agent_response = response.data.decode('utf-8')
+        logger.info("Agent response received: %d bytes", agent_response_bytes)
 
         # Step 3: Format response for Slack
         if is_scheduled:
-            slack_message = format_slack_message(agent_response, is_scheduled=True)
+            slack_message = format_slack_message(
+                agent_response,
+                is_scheduled=True,
+                is_truncated=is_truncated
+            )
         else:
             slack_message = format_slack_message(
                 agent_response,
                 is_scheduled=False,
+                is_truncated=is_truncated,
                 user_name=user_name,
                 user_question=user_question
             )
-        # Step 4: Post to Slack
-        print(f"Posting to Slack at {target_url}...")
+        # Step 4: Post to Slack (after the acknowledgment, to keep them in order)
+        _wait_for_acknowledgment(ack_future)
+        logger.info("Posting to Slack at %s...", target_url)
         slack_response = http.request(
             'POST',
             target_url,
-            body=json.dumps(slack_message).encode('utf-8'),
-            headers={'Content-Type': 'application/json'}
+            body=_json_dumps(slack_message),
+            headers=_JSON_HEADERS
         )
 
         if slack_response.status == 200:
-            print("Successfully posted to Slack")
+            logger.info("Successfully posted to Slack")
             if is_slack_request:
                 # For Slack slash commands, we already returned acknowledgment
                 # This is the delayed response sent to response_url
@@ -226,27 +360,25 @@ def lambda_handler(event, context):
                     'body': json.dumps({'message': 'Monitoring check completed'})
                 }
         else:
-            print(f"Slack post failed: {slack_response.status}")
+            logger.error("Slack post failed: %s", slack_response.status)
             return {
                 'statusCode': 500,
                 'body': json.dumps({'error': f'Slack error: {slack_response.status}'})
             }
 
     except Exception as e:
-        print(f"Error in monitoring check: {str(e)}")
-
-        # Try to send error notification to Slack
-        try:
+        logger.error("Error in monitoring check: %s", e)
+        _wait_for_acknowledgment(ack_future)
+
+        # Try to send error notification to the Slack target of this request,
+        # only building the message when there is somewhere to send it. The
+        # post runs in the background while the error response is prepared
+        error_future = None
+        if target_url:
             error_message = {
                 "text": f"🚨 *Monitoring Agent Error*\n```{str(e)}```",
                 "blocks": [
-                    {
-                        "type": "header",
-                        "text": {
-                            "type": "plain_text",
-                            "text": "🚨 Monitoring Agent Error"
-                        }
-                    },
+                    _ERROR_HEADER_BLOCK,
                     {
                         "type": "section",
                         "text": {
@@ -256,24 +388,51 @@ def lambda_handler(event, context):
                     }
                 ]
             }
+            error_future = _executor.submit(
+                http.request,
+                'POST',
+                target_url,
+                body=_json_dumps(error_message),
+                headers=_JSON_HEADERS
+            )
 
-            # Send error to appropriate target
-            error_target = target_url if 'target_url' in locals() else slack_webhook_url
-            if error_target:
-                http.request(
-                    'POST',
-                    error_target,
-                    body=json.dumps(error_message).encode('utf-8'),
-                    headers={'Content-Type': 'application/json'}
-                )
-        except Exception as slack_error:
-            print(f"Failed to send error to Slack: {str(slack_error)}")
-
-        return {
+        error_response = {
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
 
+        # Lambda freezes background threads once the handler returns, so give
+        # the notification a bounded amount of time to go out
+        if error_future is not None:
+            try:
+                error_future.result(timeout=ERROR_NOTIFICATION_TIMEOUT_SECONDS)
+            except FuturesTimeoutError:
+                logger.warning("Timed out sending error to Slack")
+            except Exception as slack_error:
+                logger.error("Failed to send error to Slack: %s", slack_error)
+
+        return error_response
+
+
+def _wait_for_acknowledgment(ack_future) -> None:
+    """
+    Wait for a background Slack acknowledgment post to finish, if one was sent.
+    The wait is bounded so a stalled response_url cannot hold up the handler.
+
+    Args:
+        ack_future: Future returned when submitting the acknowledgment, or None
+    """
+    if ack_future is None:
+        return
+    try:
+        ack_response = ack_future.result(timeout=ACKNOWLEDGMENT_TIMEOUT_SECONDS)
+        if ack_response.status != 200:
+            logger.warning("Slack acknowledgment failed: %s", ack_response.status)
+    except FuturesTimeoutError:
+        logger.warning("Timed out sending acknowledgment to Slack")
+    except Exception as ack_error:
+        logger.warning("Failed to send acknowledgment to Slack: %s", ack_error)
+
 
 def get_token_using_client_credentials(
     domain_url: str,
@@ -284,6 +443,9 @@ def get_token_using_client_credentials(
     """
     Retrieve bearer token using OAuth2 Client Credentials flow.
 
+    Tokens are cached at module level and reused by warm invocations until
+    they are about to expire.
+
     Args:
         domain_url: Cognito domain URL
         client_id: M2M client ID
@@ -296,52 +458,60 @@ def get_token_using_client_credentials(
     Raises:
         Exception: If token request fails
     """
+    cache_key = (domain_url, client_id, resource_server_id)
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached and cached["expires_at"] > time.time() + TOKEN_EXPIRY_MARGIN_SECONDS:
+        logger.debug("Using cached bearer token")
+        return cached["token"]
+
     token_url = f"{domain_url}/oauth2/token"
 
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded"
+    # Build form data - urlencode escapes characters such as '+', '/' and '='
+    # that Cognito client secrets can contain
+    params = {
+        "grant_type": "client_credentials",
+        "client_id": client_id,
+        "client_secret": client_secret
     }
 
-    # Build form data
-    data_parts = [
-        "grant_type=client_credentials",
-        f"client_id={client_id}",
-        f"client_secret={client_secret}"
-    ]
-
     # Add scope if resource server is specified
     if resource_server_id:
-        scope = f"{resource_server_id}/gateway:read"
-        data_parts.append(f"scope={scope}")
+        params["scope"] = f"{resource_server_id}/gateway:read"
 
-    data = "&".join(data_parts)
+    data = urlencode(params).encode('ascii')
 
-    print(f"Requesting token from {token_url}")
+    logger.debug("Requesting token from %s", token_url)
 
     response = http.request(
         'POST',
         token_url,
-        body=data.encode('utf-8'),
-        headers=headers
+        body=data,
+        headers=_FORM_HEADERS
     )
 
     if response.status != 200:
         error_msg = f"Failed to retrieve token: {response.status} - {response.data.decode('utf-8')}"
-        print(f"ERROR: {error_msg}")
+        logger.error(error_msg)
         raise Exception(error_msg)
 
-    token_data = json.loads(response.data.decode('utf-8'))
-    print("Successfully retrieved bearer token")
-    print(f"Token expires in {token_data.get('expires_in')} seconds")
+    token_data = _json_loads(response.data)
+    logger.info("Successfully retrieved bearer token")
+    logger.debug("Token expires in %s seconds", token_data.get('expires_in'))
 
-    return token_data["access_token"]
+    access_token = token_data["access_token"]
+    _TOKEN_CACHE[cache_key] = {
+        "token": access_token,
+        "expires_at": time.time() + int(token_data.get("expires_in", 0)),
+    }
+    return access_token
 
 
 def format_slack_message(
     agent_response: str,
     is_scheduled: bool = True,
     user_name: str = None,
-    user_question: str = None
+    user_question: str = None,
+    is_truncated: bool = False
 ) -> dict:
     """
     Format agent response into Slack message with blocks.
@@ -351,6 +521,7 @@ def format_slack_message(
         is_scheduled: Whether this is a scheduled monitoring check
         user_name: Username for user-initiated questions
         user_question: The user's question (for user-initiated flow)
+        is_truncated: Whether agent_response is only a prefix of the full response
 
     Returns:
         Slack message payload
@@ -372,8 +543,8 @@ def format_slack_message(
     cleaned_response = cleaned_response.replace('\\n', '\n')
 
     # Limit length to avoid Slack block limits (3000 chars per block)
-    if len(cleaned_response) > 2900:
-        cleaned_response = cleaned_response[:2900] + "\n\n_[Response truncated]_"
+    if is_truncated or len(cleaned_response) > SLACK_RESPONSE_MAX_CHARS:
+        cleaned_response = cleaned_response[:SLACK_RESPONSE_MAX_CHARS] + "\n\n_[Response truncated]_"
 
     # Create different messages based on flow type
     if is_scheduled:
@@ -381,14 +552,7 @@ def format_slack_message(
         message = {
             "text": f"AWS Monitoring Report - {timestamp}",
             "blocks": [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "📊 AWS Monitoring Report",
-                        "emoji": True
-                    }
-                },
+                _REPORT_HEADER_BLOCK,
                 {
                     "type": "section",
                     "text": {
@@ -396,9 +560,7 @@ def format_slack_message(
                         "text": f"*{timestamp}*"
                     }
                 },
-                {
-                    "type": "divider"
-                },
+                _DIVIDER_BLOCK,
                 {
                     "type": "section",
                     "text": {
@@ -406,15 +568,7 @@ def format_slack_message(
                         "text": cleaned_response
                     }
                 },
-                {
-                    "type": "context",
-                    "elements": [
-                        {
-                            "type": "mrkdwn",
-                            "text": "_Next check in 15 minutes_"
-                        }
-                    ]
-                }
+                _NEXT_CHECK_CONTEXT_BLOCK
             ]
         }
     else:
@@ -422,14 +576,7 @@ def format_slack_message(
         message = {
             "text": f"Answer to {user_name}'s question",
             "blocks": [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "💬 Question Answer",
-                        "emoji": True
-                    }
-                },
+                _ANSWER_HEADER_BLOCK,
                 {
                     "type": "section",
                     "text": {
@@ -437,9 +584,7 @@ def format_slack_message(
                         "text": f"*Question from @{user_name}:*\n>{user_question}"
                     }
                 },
-                {
-                    "type": "divider"
-                },
+                _DIVIDER_BLOCK,
                 {
                     "type": "section",
                     "text": {
@@ -460,3 +605,22 @@ def format_slack_message(
         }
 
     return message
+
+
+def _warm_cognito_connection() -> None:
+    """
+    Open a keep-alive connection to the Cognito domain while the container
+    initializes, so the first token request of a cold start reuses it instead
+    of paying for DNS, TCP and TLS setup inside the handler.
+    """
+    cognito_domain_url = os.environ.get('COGNITO_DOMAIN_URL')
+    if not cognito_domain_url:
+        return
+    try:
+        http.request('HEAD', cognito_domain_url, timeout=1.0, retries=False)
+    except Exception as e:
+        logger.debug("Could not pre-connect to Cognito domain: %s", e)
+
+
+# Runs once per container during the Lambda INIT phase
+_warm_cognito_connection()
@@ -6,17 +6,40 @@ Provides helper functions for AWS cross-account access and client management.
 
 import os
 import logging
+import functools
+import threading
 import boto3
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 # Default region - can be overridden by AWS_DEFAULT_REGION environment variable
 DEFAULT_REGION = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
 
+# Clients for the current account, cached by (service, region). boto3 clients
+# are thread-safe, so a single instance is shared by all tool calls
+_CLIENT_CACHE: Dict[Tuple[str, str], Any] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
 
+# Clients built from assumed-role credentials, cached by
+# (account_id, role_name, service, region) with the credentials' expiration
+_ROLE_CLIENT_CACHE: Dict[Tuple[str, str, str, str], Tuple[Any, datetime]] = {}
+
+# Assumed-role clients are replaced this long before their credentials expire
+ROLE_CREDENTIALS_REFRESH_MARGIN = timedelta(seconds=60)
+
+# Session duration requested from STS, to maximize reuse of cached credentials
+ROLE_SESSION_DURATION_SECONDS = 3600
+
+
+@functools.lru_cache(maxsize=1)
 def _get_region() -> str:
-    """Get the AWS region from environment or session, defaulting to us-east-1."""
+    """
+    Get the AWS region from environment or session, defaulting to us-east-1.
+
+    The result is cached since neither source changes for the process lifetime.
+    """
     # Try environment variable first
     region = os.environ.get('AWS_DEFAULT_REGION') or os.environ.get('AWS_REGION')
     if region:
@@ -34,6 +57,84 @@ def _get_region() -> str:
     return 'us-east-1'
 
 
+def _get_client(service: str, region: str):
+    """
+    Get a cached boto3 client for the current account, creating it on first use.
+
+    Args:
+        service: AWS service name (e.g., 'cloudwatch', 'logs', 'sts')
+        region: AWS region for the client
+
+    Returns:
+        Boto3 client for the specified service and region
+    """
+    key = (service, region)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        with _CLIENT_CACHE_LOCK:
+            client = _CLIENT_CACHE.get(key)
+            if client is None:
+                client = boto3.client(service, region_name=region)
+                _CLIENT_CACHE[key] = client
+    return client
+
+
+def _get_assumed_role_client(
+    service: str,
+    account_id: str,
+    role_name: str,
+    region: str,
+):
+    """
+    Get a boto3 client using credentials from an assumed role in another account.
+
+    Clients are cached until shortly before their credentials expire.
+
+    Args:
+        service: AWS service name (e.g., 'cloudwatch', 'logs', 'sts')
+        account_id: Target AWS account ID
+        role_name: IAM role name to assume in target account
+        region: AWS region for the client
+
+    Returns:
+        Boto3 client for the specified service in the target account
+
+    Raises:
+        Exception: If cross-account role assumption fails
+    """
+    cache_key = (account_id, role_name, service, region)
+    cached = _ROLE_CLIENT_CACHE.get(cache_key)
+    if cached and cached[1] > datetime.now(timezone.utc) + ROLE_CREDENTIALS_REFRESH_MARGIN:
+        return cached[0]
+
+    logger.info(
+        f"Setting up cross-account access for account {account_id} with role {role_name}"
+    )
+    sts = _get_client("sts", region)
+    role_arn = f"arn:aws:iam::{account_id}:role/{role_name}"
+
+    try:
+        assumed_role = sts.assume_role(
+            RoleArn=role_arn,
+            RoleSessionName="MonitoringAgentSession",
+            DurationSeconds=ROLE_SESSION_DURATION_SECONDS,
+        )
+    except Exception as e:
+        logger.error(f"Error assuming role {role_arn} for {service} client: {str(e)}")
+        raise
+    credentials = assumed_role["Credentials"]
+
+    client = boto3.client(
+        service,
+        region_name=region,
+        aws_access_key_id=credentials["AccessKeyId"],
+        aws_secret_access_key=credentials["SecretAccessKey"],
+        aws_session_token=credentials["SessionToken"],
+    )
+    _ROLE_CLIENT_CACHE[cache_key] = (client, credentials["Expiration"])
+    return client
+
+
 def _get_cross_account_client(
     service: str,
     account_id: Optional[str] = None,
@@ -62,35 +163,12 @@ def _get_cross_account_client(
     # Determine the region to use
     target_region = region or _get_region()
 
-    try:
-        if account_id and role_name:
-            logger.info(
-                f"Setting up cross-account access for account {account_id} with role {role_name}"
-            )
-            sts = boto3.client("sts", region_name=target_region)
-            role_arn = f"arn:aws:iam::{account_id}:role/{role_name}"
-
-            assumed_role = sts.assume_role(
-                RoleArn=role_arn,
-                RoleSessionName="MonitoringAgentSession",
-            )
-            credentials = assumed_role["Credentials"]
-
-            return boto3.client(
-                service,
-                region_name=target_region,
-                aws_access_key_id=credentials["AccessKeyId"],
-                aws_secret_access_key=credentials["SecretAccessKey"],
-                aws_session_token=credentials["SessionToken"],
-            )
-
-        return boto3.client(service, region_name=target_region)
-
-    except Exception as e:
-        logger.error(f"Error creating {service} client: {str(e)}")
-        raise
+    if account_id and role_name:
+        return _get_assumed_role_client(service, account_id, role_name, target_region)
+    return _get_client(service, target_region)
 
 
+@functools.lru_cache(maxsize=64)
 def _format_account_context(
     account_id: Optional[str] = None,
 ) -> str:
@@ -5,9 +5,13 @@ Provides LangChain tools for AWS CloudWatch monitoring operations including
 dashboards, logs, alarms, and cross-account access.
 """
 
+import json
+import time
+import heapq
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 from langchain_core.tools import tool
 
@@ -31,6 +35,169 @@ SERVICE_LOG_GROUPS = {
     "waf": ["/aws/waf/"],
 }
 
+# CloudWatch Logs Insights query that classifies events server-side. An event
+# is an error if its lowercased message contains any error keyword, otherwise
+# a warning if it contains "warn" (matching "warn" and "warning")
+LOG_ANALYSIS_QUERY = """
+fields toLower(@message) as msg
+| fields strcontains(msg, "error") + strcontains(msg, "fail") + strcontains(msg, "exception") + strcontains(msg, "critical") as error_hits,
+         strcontains(msg, "warn") as warning_hits
+| fields least(error_hits, 1) as is_error, warning_hits * (1 - least(error_hits, 1)) as is_warning
+| stats count(*) as total, sum(is_error) as errors, sum(is_warning) as warnings
+"""
+
+# Used to convert the `hours` look-back window to epoch milliseconds
+MILLISECONDS_PER_HOUR = 3_600_000
+
+# Logs Insights query returning the most recent events across log groups
+RECENT_EVENTS_QUERY = "fields @timestamp, @log, @message | sort @timestamp desc"
+
+# Longest time to wait for a Logs Insights query before giving up
+INSIGHTS_QUERY_TIMEOUT_SECONDS = 60
+
+# Largest page size accepted by describe_log_groups
+DESCRIBE_LOG_GROUPS_MAX_PAGE_SIZE = 50
+
+# Logs Insights accepts at most this many log groups per query
+INSIGHTS_MAX_LOG_GROUPS = 50
+
+# Maximum number of Logs Insights queries run at the same time
+INSIGHTS_MAX_CONCURRENT_QUERIES = 10
+
+
+def _run_insights_query(
+    logs_client,
+    log_group_names: List[str],
+    start_time: int,
+    query_string: str,
+    limit: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """
+    Run a CloudWatch Logs Insights query and wait for its results.
+
+    Args:
+        logs_client: Boto3 CloudWatch Logs client
+        log_group_names: Log groups to query (at most 50)
+        start_time: Start of the time range in epoch milliseconds
+        query_string: Logs Insights query
+        limit: Maximum number of result rows (optional)
+
+    Returns:
+        List of result rows, each mapping field name to value
+
+    Raises:
+        Exception: If the query fails, is cancelled or times out
+    """
+    query_kwargs = {
+        "logGroupNames": log_group_names,
+        "startTime": start_time // 1000,
+        "endTime": int(time.time()),
+        "queryString": query_string,
+    }
+    if limit:
+        query_kwargs["limit"] = limit
+    query_id = logs_client.start_query(**query_kwargs)["queryId"]
+
+    # Poll with exponential backoff until the query finishes
+    delay = 0.25
+    deadline = time.monotonic() + INSIGHTS_QUERY_TIMEOUT_SECONDS
+    while True:
+        response = logs_client.get_query_results(queryId=query_id)
+        status = response["status"]
+        if status == "Complete":
+            break
+        if status in ("Failed", "Cancelled", "Timeout", "Unknown"):
+            raise Exception(f"Logs Insights query {query_id} ended with status {status}")
+        if time.monotonic() > deadline:
+            logs_client.stop_query(queryId=query_id)
+            raise Exception(f"Logs Insights query {query_id} timed out")
+        time.sleep(delay)
+        delay = min(delay * 2, 2.0)
+
+    return [
+        {column["field"]: column["value"] for column in row}
+        for row in response.get("results", [])
+    ]
+
+
+def _run_insights_batch(
+    logs_client,
+    log_group_names: List[str],
+    start_time: int,
+    limit: int,
+) -> Tuple[List[Dict[str, str]], List[str]]:
+    """
+    Fetch the most recent log events across many log groups with Logs Insights.
+
+    Log groups are queried in batches of INSIGHTS_MAX_LOG_GROUPS, with the
+    batches running concurrently. Each batch returns its events newest first,
+    so the batches are merged rather than re-sorted. A batch that fails is
+    logged and reported back to the caller; if every batch fails, the first
+    error is raised.
+
+    Args:
+        logs_client: Boto3 CloudWatch Logs client
+        log_group_names: Log groups to fetch events from
+        start_time: Start of the time range in epoch milliseconds
+        limit: Maximum number of events to return
+
+    Returns:
+        Tuple of up to `limit` events, newest first, each with 'timestamp',
+        'log_group' and 'message' keys, and a description of each failed batch
+
+    Raises:
+        Exception: If the query failed for every batch
+    """
+    batches = [
+        log_group_names[i:i + INSIGHTS_MAX_LOG_GROUPS]
+        for i in range(0, len(log_group_names), INSIGHTS_MAX_LOG_GROUPS)
+    ]
+
+    def run_batch(batch: List[str]):
+        try:
+            return _run_insights_query(
+                logs_client, batch, start_time, RECENT_EVENTS_QUERY, limit=limit
+            ), None
+        except Exception as batch_error:
+            logger.warning(
+                f"Error querying log groups {batch[0]}..{batch[-1]}: {str(batch_error)}"
+            )
+            return [], batch_error
+
+    with ThreadPoolExecutor(max_workers=INSIGHTS_MAX_CONCURRENT_QUERIES) as executor:
+        outcomes = list(executor.map(run_batch, batches))
+
+    errors = [error for _, error in outcomes if error is not None]
+    if errors and len(errors) == len(batches):
+        raise errors[0]
+
+    failures = [
+        f"{len(batch)} log group(s) {batch[0]}..{batch[-1]}: {str(error)}"
+        for batch, (_, error) in zip(batches, outcomes)
+        if error is not None
+    ]
+    batch_results = [batch_rows for batch_rows, _ in outcomes]
+
+    # Insights timestamps ("YYYY-MM-DD HH:MM:SS.mmm", UTC) sort lexicographically
+    rows = itertools.islice(
+        heapq.merge(
+            *batch_results,
+            key=lambda row: row.get("@timestamp", ""),
+            reverse=True,
+        ),
+        limit,
+    )
+    events = [
+        {
+            "timestamp": row.get("@timestamp", ""),
+            # @log is reported as "<account id>:<log group name>"
+            "log_group": row.get("@log", "").split(":", 1)[-1],
+            "message": row.get("@message", ""),
+        }
+        for row in rows
+    ]
+    return events, failures
+
 
 @tool
 def list_cloudwatch_dashboards(
@@ -60,13 +227,11 @@ def list_cloudwatch_dashboards(
         if not dashboards:
             return f"No CloudWatch dashboards found in {account_context}."
 
-        result = [f"Found {len(dashboards)} CloudWatch dashboard(s) in {account_context}:\n"]
-
-        for dashboard in dashboards:
-            result.append(f"  - {dashboard['DashboardName']}")
+        header = f"Found {len(dashboards)} CloudWatch dashboard(s) in {account_context}:\n"
+        body = "\n".join(f"  - {dashboard['DashboardName']}" for dashboard in dashboards)
 
         logger.info(f"Listed {len(dashboards)} dashboards from {account_context}")
-        return "\n".join(result)
+        return f"{header}\n{body}"
 
     except Exception as e:
         error_msg = f"Error listing CloudWatch dashboards: {str(e)}"
@@ -79,6 +244,7 @@ def get_dashboard_summary(
     dashboard_name: str,
     account_id: Optional[str] = None,
     role_name: Optional[str] = None,
+    include_body: bool = False,
 ) -> str:
     """
     Get detailed summary of a specific CloudWatch dashboard.
@@ -89,24 +255,45 @@ def get_dashboard_summary(
         dashboard_name: Name of the CloudWatch dashboard
         account_id: Target AWS account ID for cross-account access (optional)
         role_name: IAM role name to assume in target account (optional)
+        include_body: Also fetch the dashboard body and report its widget
+                      count (default: False)
 
     Returns:
         Formatted string with dashboard summary
     """
     try:
         cloudwatch = _get_cross_account_client("cloudwatch", account_id, role_name)
-        response = cloudwatch.get_dashboard(DashboardName=dashboard_name)
-
         account_context = _format_account_context(account_id)
-        dashboard_body = response.get("DashboardBody", "")
+
+        # The summary fields come from list_dashboards, which avoids
+        # downloading the dashboard body unless it was asked for
+        dashboard = None
+        paginator = cloudwatch.get_paginator("list_dashboards")
+        for page in paginator.paginate(DashboardNamePrefix=dashboard_name):
+            for entry in page.get("DashboardEntries", []):
+                if entry["DashboardName"] == dashboard_name:
+                    dashboard = entry
+                    break
+            if dashboard:
+                break
+
+        if not dashboard:
+            return f"Dashboard '{dashboard_name}' not found in {account_context}."
 
         result = [
             f"Dashboard: {dashboard_name}",
             f"Account: {account_context}",
-            f"ARN: {response.get('DashboardArn', 'N/A')}",
-            f"\nConfiguration retrieved successfully.",
+            f"ARN: {dashboard.get('DashboardArn', 'N/A')}",
+            f"Last Modified: {dashboard.get('LastModified', 'N/A')}",
+            f"Size: {dashboard.get('Size', 'N/A')} bytes",
         ]
 
+        if include_body:
+            response = cloudwatch.get_dashboard(DashboardName=dashboard_name)
+            dashboard_body = json.loads(response.get("DashboardBody") or "{}")
+            result.append(f"Widgets: {len(dashboard_body.get('widgets', []))}")
+            result.append(f"\nConfiguration retrieved successfully.")
+
         logger.info(f"Retrieved dashboard summary for {dashboard_name}")
         return "\n".join(result)
 
@@ -121,6 +308,7 @@ def list_log_groups(
     account_id: Optional[str] = None,
     role_name: Optional[str] = None,
     limit: int = 50,
+    prefix: Optional[str] = None,
 ) -> str:
     """
     List CloudWatch log groups in an AWS account.
@@ -131,6 +319,8 @@ def list_log_groups(
         account_id: Target AWS account ID for cross-account access (optional)
         role_name: IAM role name to assume in target account (optional)
         limit: Maximum number of log groups to return (default: 50)
+        prefix: Only return log groups whose name starts with this prefix,
+                e.g. '/aws/lambda/' (optional)
 
     Returns:
         Formatted string with list of log group names
@@ -139,26 +329,31 @@ def list_log_groups(
         logs_client = _get_cross_account_client("logs", account_id, role_name)
         account_context = _format_account_context(account_id)
 
-        log_groups = []
-        paginator = logs_client.get_paginator("describe_log_groups")
+        # Filter by prefix server-side and stop paging once `limit` is reached
+        paginate_kwargs = {
+            "PaginationConfig": {
+                "MaxItems": limit,
+                "PageSize": min(limit, DESCRIBE_LOG_GROUPS_MAX_PAGE_SIZE),
+            }
+        }
+        if prefix:
+            paginate_kwargs["logGroupNamePrefix"] = prefix
 
-        for page in paginator.paginate():
-            for log_group in page["logGroups"]:
-                log_groups.append(log_group["logGroupName"])
-                if len(log_groups) >= limit:
-                    break
-            if len(log_groups) >= limit:
-                break
+        paginator = logs_client.get_paginator("describe_log_groups")
+        log_groups = list(
+            paginator.paginate(**paginate_kwargs).search("logGroups[].logGroupName")
+        )
 
         if not log_groups:
+            if prefix:
+                return f"No log groups starting with '{prefix}' found in {account_context}."
             return f"No log groups found in {account_context}."
 
-        result = [f"Found {len(log_groups)} log group(s) in {account_context}:\n"]
-        for log_group in log_groups:
-            result.append(f"  - {log_group}")
+        header = f"Found {len(log_groups)} log group(s) in {account_context}:\n"
+        body = "\n".join(f"  - {log_group}" for log_group in log_groups)
 
         logger.info(f"Listed {len(log_groups)} log groups from {account_context}")
-        return "\n".join(result)
+        return f"{header}\n{body}"
 
     except Exception as e:
         error_msg = f"Error listing log groups: {str(e)}"
@@ -200,47 +395,17 @@ def fetch_cloudwatch_logs_for_service(
             [f"/aws/{service_name}/"],
         )
 
-        start_time = int((datetime.now() - timedelta(hours=hours)).timestamp() * 1000)
-        all_logs = []
+        start_time = int(time.time() * 1000) - hours * MILLISECONDS_PER_HOUR
 
+        # Collect the service's log groups, then query them in batches. A dict
+        # de-duplicates names across prefixes while keeping their order
+        log_group_names: Dict[str, None] = {}
         for prefix in log_group_prefixes:
             try:
                 paginator = logs_client.get_paginator("describe_log_groups")
                 for page in paginator.paginate(logGroupNamePrefix=prefix):
                     for log_group in page["logGroups"]:
-                        try:
-                            events = logs_client.filter_log_events(
-                                logGroupName=log_group["logGroupName"],
-                                startTime=start_time,
-                                limit=max_events,
-                            )
-
-                            for event in events.get("events", []):
-                                timestamp = datetime.fromtimestamp(
-                                    event["timestamp"] / 1000
-                                ).isoformat()
-                                all_logs.append(
-                                    {
-                                        "timestamp": timestamp,
-                                        "log_group": log_group["logGroupName"],
-                                        "message": event["message"],
-                                    }
-                                )
-
-                                if len(all_logs) >= max_events:
-                                    break
-
-                        except Exception as log_error:
-                            logger.warning(
-                                f"Error fetching logs from {log_group['logGroupName']}: {str(log_error)}"
-                            )
-                            continue
-
-                        if len(all_logs) >= max_events:
-                            break
-
-                    if len(all_logs) >= max_events:
-                        break
+                        log_group_names.setdefault(log_group["logGroupName"], None)
 
             except Exception as group_error:
                 logger.warning(
@@ -248,17 +413,36 @@ def fetch_cloudwatch_logs_for_service(
                 )
                 continue
 
+        all_logs = []
+        failed_batches = []
+        if log_group_names:
+            all_logs, failed_batches = _run_insights_batch(
+                logs_client, list(log_group_names), start_time, max_events
+            )
+
+        # Report log groups that could not be queried instead of hiding them
+        failure_notes = []
+        if failed_batches:
+            failure_notes.append("Warning: some log groups could not be queried:")
+            for failure in failed_batches:
+                failure_notes.append(f"  - {failure}")
+
         if not all_logs:
-            return f"No logs found for service '{service_name}' in the last {hours} hour(s) in {account_context}."
+            return "\n".join(
+                [f"No logs found for service '{service_name}' in the last {hours} hour(s) in {account_context}."]
+                + failure_notes
+            )
 
         result = [
             f"Retrieved {len(all_logs)} log entries for service '{service_name}' from {account_context}:\n"
         ]
 
-        for log in all_logs[:max_events]:
+        for log in all_logs:
             result.append(f"[{log['timestamp']}] {log['log_group']}")
             result.append(f"  {log['message'][:200]}...\n")
 
+        result.extend(failure_notes)
+
         logger.info(
             f"Retrieved {len(all_logs)} log entries for service {service_name}"
         )
@@ -296,33 +480,20 @@ def analyze_log_group(
         logs_client = _get_cross_account_client("logs", account_id, role_name)
         account_context = _format_account_context(account_id)
 
-        start_time = int((datetime.now() - timedelta(hours=hours)).timestamp() * 1000)
+        start_time = int(time.time() * 1000) - hours * MILLISECONDS_PER_HOUR
 
-        events = logs_client.filter_log_events(
-            logGroupName=log_group_name,
-            startTime=start_time,
-            limit=1000,
+        # Count and classify the events server-side instead of downloading them
+        rows = _run_insights_query(
+            logs_client, [log_group_name], start_time, LOG_ANALYSIS_QUERY
         )
-
-        log_events = events.get("events", [])
-        total_events = len(log_events)
+        counts = rows[0] if rows else {}
+        total_events = int(float(counts.get("total", 0)))
+        error_count = int(float(counts.get("errors", 0)))
+        warning_count = int(float(counts.get("warnings", 0)))
 
         if total_events == 0:
             return f"No log events found in '{log_group_name}' for the last {hours} hour(s) in {account_context}."
 
-        # Analyze for errors
-        error_count = 0
-        warning_count = 0
-        error_keywords = ["error", "fail", "exception", "critical"]
-        warning_keywords = ["warning", "warn"]
-
-        for event in log_events:
-            message_lower = event["message"].lower()
-            if any(keyword in message_lower for keyword in error_keywords):
-                error_count += 1
-            elif any(keyword in message_lower for keyword in warning_keywords):
-                warning_count += 1
-
         error_rate = (error_count / total_events * 100) if total_events > 0 else 0
         warning_rate = (warning_count / total_events * 100) if total_events > 0 else 0
 
@@ -381,39 +552,38 @@ def get_cloudwatch_alarms_for_service(
         cloudwatch = _get_cross_account_client("cloudwatch", account_id, role_name)
         account_context = _format_account_context(account_id)
 
-        response = cloudwatch.describe_alarms()
-        all_alarms = response.get("MetricAlarms", [])
-
-        # Filter alarms related to the service
+        # Filter alarms related to the service. describe_alarms returns at
+        # most 100 alarms per call, so page through all of them
+        service_name_lower = service_name.lower()
         service_alarms = []
-        for alarm in all_alarms:
-            alarm_name = alarm.get("AlarmName", "").lower()
-            namespace = alarm.get("Namespace", "").lower()
-
-            if service_name.lower() in alarm_name or service_name.lower() in namespace:
-                service_alarms.append(
-                    {
-                        "name": alarm["AlarmName"],
-                        "state": alarm["StateValue"],
-                        "reason": alarm.get("StateReason", "N/A"),
-                        "namespace": alarm.get("Namespace", "N/A"),
-                    }
-                )
+        alarm_ok = in_alarm = insufficient_data = 0
+        paginator = cloudwatch.get_paginator("describe_alarms")
+        for page in paginator.paginate(AlarmTypes=["MetricAlarm"]):
+            for alarm in page.get("MetricAlarms", []):
+                alarm_name = alarm.get("AlarmName", "").lower()
+                namespace = alarm.get("Namespace", "").lower()
+
+                if service_name_lower in alarm_name or service_name_lower in namespace:
+                    service_alarms.append(
+                        {
+                            "name": alarm["AlarmName"],
+                            "state": alarm["StateValue"],
+                            "reason": alarm.get("StateReason", "N/A"),
+                            "namespace": alarm.get("Namespace", "N/A"),
+                        }
+                    )
+
+                    # Count by state while filtering
+                    if alarm["StateValue"] == "OK":
+                        alarm_ok += 1
+                    elif alarm["StateValue"] == "ALARM":
+                        in_alarm += 1
+                    else:
+                        insufficient_data += 1
 
         if not service_alarms:
             return f"No CloudWatch alarms found for service '{service_name}' in {account_context}."
 
-        # Group by state
-        alarm_state = alarm_ok = in_alarm = insufficient_data = 0
-
-        for alarm in service_alarms:
-            if alarm["state"] == "OK":
-                alarm_ok += 1
-            elif alarm["state"] == "ALARM":
-                in_alarm += 1
-            else:
-                insufficient_data += 1
-
         result = [
             f"CloudWatch Alarms for '{service_name}' in {account_context}:",
             f"\nSummary:",
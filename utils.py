@@ -2,24 +2,98 @@
 Utility functions for the ambient monitoring agent.
 """
 import logging
+import functools
 from pathlib import Path
-from typing import Union, Dict, Optional
+from typing import Union, Dict, Optional, Tuple
 
 import yaml
 import boto3
 from boto3 import Session
 
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 # set a logger
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# App client IDs found in or created for a user pool, cached by
+# (user_pool_id, client_name) so repeated lookups skip the client scan
+_USER_POOL_CLIENT_IDS: Dict[Tuple[str, str], str] = {}
+
+
+@functools.lru_cache(maxsize=16)
+def _load_yaml_cached(
+    config_file: str,
+    mtime: float
+) -> Optional[Dict]:
+    """
+    Parse a YAML file. Cached on the path and modification time, so an
+    edited file is parsed again on its next load.
+
+    Args:
+        config_file: Absolute path to the YAML file
+        mtime: Modification time of the file, used only as part of the cache key
+
+    Returns:
+        The parsed YAML content
+    """
+    logger.info(f"Loading config from local file system: {config_file}")
+    content = Path(config_file).read_bytes()
+    return yaml.load(content, Loader=_YamlLoader)
+
+
+@functools.lru_cache(maxsize=16)
+def _read_text_cached(
+    file_path: str,
+    mtime: float
+) -> str:
+    """
+    Read a text file. Cached on the path and modification time, so an
+    edited file is read again on its next load.
+
+    Args:
+        file_path: Absolute path to the file
+        mtime: Modification time of the file, used only as part of the cache key
+
+    Returns:
+        The file content as a string
+    """
+    with open(file_path, 'r') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=16)
+def _read_package_text_cached(
+    package: str,
+    resource_path: str
+) -> str:
+    """
+    Read a text resource from an installed package. Works for packages
+    imported from zip files or wheels as well as from disk. Packaged
+    resources do not change while the process runs, so results are cached.
+
+    Args:
+        package: Name of the package containing the resource
+        resource_path: Path of the resource relative to the package
+
+    Returns:
+        The resource content as a string
+    """
+    from importlib.resources import files
+    return files(package).joinpath(resource_path).read_text(encoding="utf-8")
+
 
 def load_config(
     config_file: Union[Path, str]
 ) -> Optional[Dict]:
     """
-    Load configuration from a local file.
+    Load configuration from a local file. Results are cached until the file
+    changes. Failed loads are not cached, so the next call tries again.
 
     Args:
         config_file: Path to the local file
@@ -28,11 +102,11 @@ def load_config(
         Dictionary with the loaded configuration
     """
     try:
-        config_data: Optional[Dict] = None
-        logger.info(f"Loading config from local file system: {config_file}")
-        content = Path(config_file).read_text()
-        config_data = yaml.safe_load(content)
-        logger.info(f"Loaded config from local file system: {config_data}")
+        # The cached helper raises on failure, so only successful parses
+        # are cached and the None returned below is never memoized
+        config_path = Path(config_file).resolve()
+        config_data = _load_yaml_cached(str(config_path), config_path.stat().st_mtime)
+        logger.debug("Loaded config from local file system: %s", config_data)
     except Exception as e:
         logger.error(f"Error loading config from local file system: {e}")
         config_data = None
@@ -43,7 +117,8 @@ def load_system_prompt(
     prompt_path: str
 ) -> str:
     """
-    Load the system prompt from a file path.
+    Load the system prompt from a file path. Results are cached until the
+    file changes.
 
     Args:
         prompt_path: Relative or absolute path to the system prompt file
@@ -54,19 +129,14 @@ def load_system_prompt(
     try:
         # First try absolute path or relative to current directory
         if Path(prompt_path).exists():
-            with open(prompt_path, 'r') as f:
-                prompt_content = f.read()
-            logger.info(f"Successfully loaded system prompt from {prompt_path}")
+            resolved_path = Path(prompt_path).resolve()
+            prompt_content = _read_text_cached(str(resolved_path), resolved_path.stat().st_mtime)
+            logger.info(f"Successfully loaded system prompt from {resolved_path}")
             return prompt_content
 
         # If not found, try relative to package directory
-        import pkg_resources
-        package_prompt_path = pkg_resources.resource_filename(
-            "ml_cost_analysis", prompt_path
-        )
-        with open(package_prompt_path, 'r') as f:
-            prompt_content = f.read()
-        logger.info(f"Successfully loaded system prompt from package: {package_prompt_path}")
+        prompt_content = _read_package_text_cached("ml_cost_analysis", prompt_path)
+        logger.info(f"Successfully loaded system prompt from package: {prompt_path}")
         return prompt_content
     except FileNotFoundError:
         logger.error(f"System prompt file not found at {prompt_path}")
@@ -168,12 +238,36 @@ def get_or_create_resource_server(cognito, user_pool_id, RESOURCE_SERVER_ID, RES
         )
         return RESOURCE_SERVER_ID
     
+def _find_user_pool_client_id(cognito, user_pool_id, client_name):
+    """
+    Find the ID of the app client with the given name, paging through all
+    clients in the user pool. Found IDs are cached.
+
+    Args:
+        cognito: Boto3 Cognito Identity Provider client
+        user_pool_id: The Cognito User Pool ID
+        client_name: Name of the app client
+
+    Returns:
+        The app client ID, or None if the user pool has no client with that name
+    """
+    cache_key = (user_pool_id, client_name)
+    if cache_key in _USER_POOL_CLIENT_IDS:
+        return _USER_POOL_CLIENT_IDS[cache_key]
+
+    paginator = cognito.get_paginator("list_user_pool_clients")
+    for page in paginator.paginate(UserPoolId=user_pool_id, PaginationConfig={"PageSize": 60}):
+        for client in page["UserPoolClients"]:
+            if client["ClientName"] == client_name:
+                _USER_POOL_CLIENT_IDS[cache_key] = client["ClientId"]
+                return client["ClientId"]
+    return None
+
 def get_or_create_m2m_client(cognito, user_pool_id, CLIENT_NAME, RESOURCE_SERVER_ID):
-    response = cognito.list_user_pool_clients(UserPoolId=user_pool_id, MaxResults=60)
-    for client in response["UserPoolClients"]:
-        if client["ClientName"] == CLIENT_NAME:
-            describe = cognito.describe_user_pool_client(UserPoolId=user_pool_id, ClientId=client["ClientId"])
-            return client["ClientId"], describe["UserPoolClient"]["ClientSecret"]
+    client_id = _find_user_pool_client_id(cognito, user_pool_id, CLIENT_NAME)
+    if client_id:
+        describe = cognito.describe_user_pool_client(UserPoolId=user_pool_id, ClientId=client_id)
+        return client_id, describe["UserPoolClient"]["ClientSecret"]
     print('creating new m2m client')
     created = cognito.create_user_pool_client(
         UserPoolId=user_pool_id,
@@ -185,6 +279,7 @@ def get_or_create_m2m_client(cognito, user_pool_id, CLIENT_NAME, RESOURCE_SERVER
         SupportedIdentityProviders=["COGNITO"],
         ExplicitAuthFlows=["ALLOW_REFRESH_TOKEN_AUTH"]
     )
+    _USER_POOL_CLIENT_IDS[(user_pool_id, CLIENT_NAME)] = created["UserPoolClient"]["ClientId"]
     return created["UserPoolClient"]["ClientId"], created["UserPoolClient"]["ClientSecret"]
 
 def create_cognito_domain(
@@ -292,11 +387,38 @@ def create_cognito_domain(
         logger.error(f"Error creating Cognito domain: {e}")
         raise
 
-def get_or_create_user_pool(cognito, USER_POOL_NAME, CREATE_USER_POOL: bool = False):
-    response = cognito.list_user_pools(MaxResults=60)
-    for pool in response["UserPools"]:
+def _iter_user_pools(cognito):
+    paginator = cognito.get_paginator("list_user_pools")
+    for page in paginator.paginate(PaginationConfig={"PageSize": 60}):
+        yield from page["UserPools"]
+
+def get_or_create_user_pool(
+    cognito,
+    USER_POOL_NAME,
+    CREATE_USER_POOL: bool = False,
+    return_domain: bool = False
+):
+    """
+    Find the user pool with the given name, optionally creating it.
+
+    Args:
+        cognito: Boto3 Cognito Identity Provider client
+        USER_POOL_NAME: Name of the user pool
+        CREATE_USER_POOL: Create the pool (and its domain) if it does not exist
+        return_domain: Also look up and return the pool's domain
+
+    Returns:
+        The user pool ID, or None if the pool does not exist and was not
+        created. With return_domain, a (user_pool_id, domain) tuple instead,
+        which is (None, None) if the pool does not exist and was not created
+    """
+    for pool in _iter_user_pools(cognito):
         if pool["Name"] == USER_POOL_NAME:
             user_pool_id = pool["Id"]
+            if not return_domain:
+                return user_pool_id
+
+            # Describing the pool is only needed to look up its domain
             response = cognito.describe_user_pool(
                 UserPoolId=user_pool_id
             )
@@ -306,12 +428,12 @@ def get_or_create_user_pool(cognito, USER_POOL_NAME, CREATE_USER_POOL: bool = Fa
             domain = user_pool.get('Domain')
         
             if domain:
-                region = user_pool_id.split('_')[0] if '_' in user_pool_id else REGION
+                region = user_pool_id.split('_')[0] if '_' in user_pool_id else cognito.meta.region_name
                 domain_url = f"https://{domain}.auth.{region}.amazoncognito.com"
                 print(f"Found domain for user pool {user_pool_id}: {domain} ({domain_url})")
             else:
                 print(f"No domains found for user pool {user_pool_id}")
-            return pool["Id"]
+            return user_pool_id, domain
     print('Creating new user pool')
     if CREATE_USER_POOL:
         created = cognito.create_user_pool(PoolName=USER_POOL_NAME)
@@ -328,5 +450,9 @@ def get_or_create_user_pool(cognito, USER_POOL_NAME, CREATE_USER_POOL: bool = Fa
         print("Domain created as well")
     else:
         print(f"User pool creation set to {CREATE_USER_POOL}. Returning.")
+        if return_domain:
+            return None, None
         return
-    return created["UserPool"]["Id"]
\ No newline at end of file
+    if return_domain:
+        return user_pool_id, user_pool_domain
+    return user_pool_id
\ No newline at end of file